@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""Build the third-party stack needed by pythonocc-core.
+
+Builds Tcl, Tk, FreeType, SWIG and OCCT from the source tarballs found in
+``--party3-src`` and installs everything under ``--prefix``.  Tcl, FreeType
+and SWIG have no interdependencies and are built in parallel; Tk (needs Tcl)
+and OCCT (needs all of the above) follow serially.
+"""
+
+import argparse
+import multiprocessing
+import shutil
+import subprocess
+import sys
+import tarfile
+from pathlib import Path
+
+from build_common import (
+    ccache_cmake_args,
+    ccache_env,
+    compile_flags_cmake_args,
+    configure_ccache,
+    jobs,
+    rmtree_async,
+    run_command,
+    set_log,
+)
+
+
+def extract_tar(tar_path, dest_dir):
+    """Extract a ``.tar.gz`` archive into ``dest_dir``.
+
+    Decompression dominates here, and Python's gzip is single-threaded;
+    when pigz is installed the inflate runs in its worker threads and
+    tarfile only parses the already-decompressed stream.  Either way we
+    extract every member once in order, so the streaming modes with a
+    large block size beat the seekable ``r:gz`` reader, which
+    double-buffers through small reads.
+    """
+    print(f"extracting {tar_path}", flush=True)
+    pigz = shutil.which("pigz")
+    if pigz:
+        proc = subprocess.Popen([pigz, "-dc", str(tar_path)], stdout=subprocess.PIPE)
+        try:
+            with tarfile.open(
+                fileobj=proc.stdout, mode="r|", bufsize=1024 * 1024
+            ) as tf:
+                tf.extractall(dest_dir)
+        finally:
+            proc.stdout.close()
+        if proc.wait():
+            raise subprocess.CalledProcessError(proc.returncode, proc.args)
+        return
+    with open(tar_path, "rb") as fileobj:
+        with tarfile.open(fileobj=fileobj, mode="r|gz", bufsize=1024 * 1024) as tf:
+            tf.extractall(dest_dir)
+
+
+def find_src_dir(src_root, prefix):
+    """Return the extracted source directory whose name starts with ``prefix``."""
+    matches = sorted(
+        p for p in Path(src_root).iterdir() if p.is_dir() and p.name.startswith(prefix)
+    )
+    if not matches:
+        raise FileNotFoundError(f"no extracted source matching {prefix}* in {src_root}")
+    return matches[0]
+
+
+def _autoconf_env():
+    """Environment for the autoconf units: compile through ccache when present.
+
+    The CMake launcher args only reach OCCT; the configure-based Tcl, Tk,
+    FreeType and SWIG builds pick ccache up via CC/CXX instead.  The same
+    env must feed configure and make, since --config-cache records CC.
+    """
+    env = ccache_env()
+    if shutil.which("ccache"):
+        env.setdefault("CC", "ccache gcc")
+        env.setdefault("CXX", "ccache g++")
+    return env
+
+
+def build_tcl(src_root, prefix, jobs):
+    unix_dir = find_src_dir(src_root, "tcl") / "unix"
+    env = _autoconf_env()
+    if not (unix_dir / "Makefile").exists():
+        run_command(
+            [
+                "./configure",
+                "--config-cache",
+                f"--prefix={prefix}",
+                "--enable-shared",
+                "--enable-threads",
+            ],
+            cwd=unix_dir,
+            env=env,
+        )
+    run_command(["make", f"-j{jobs}"], cwd=unix_dir, env=env)
+    run_command(["make", "install"], cwd=unix_dir, env=env)
+
+
+def build_tk(src_root, prefix, jobs):
+    unix_dir = find_src_dir(src_root, "tk") / "unix"
+    env = _autoconf_env()
+    if not (unix_dir / "Makefile").exists():
+        run_command(
+            [
+                "./configure",
+                "--config-cache",
+                f"--prefix={prefix}",
+                "--enable-shared",
+                "--enable-threads",
+                f"--with-tcl={prefix}/lib",
+            ],
+            cwd=unix_dir,
+            env=env,
+        )
+    run_command(["make", f"-j{jobs}"], cwd=unix_dir, env=env)
+    run_command(["make", "install"], cwd=unix_dir, env=env)
+
+
+def build_freetype(src_root, prefix, jobs):
+    src_dir = find_src_dir(src_root, "freetype")
+    env = _autoconf_env()
+    if not (src_dir / "Makefile").exists():
+        run_command(
+            ["./configure", "--config-cache", f"--prefix={prefix}", "--enable-shared"],
+            cwd=src_dir,
+            env=env,
+        )
+    run_command(["make", f"-j{jobs}"], cwd=src_dir, env=env)
+    run_command(["make", "install"], cwd=src_dir, env=env)
+
+
+def build_swig(src_root, prefix, jobs):
+    src_dir = find_src_dir(src_root, "swig")
+    env = _autoconf_env()
+    if not (src_dir / "Makefile").exists():
+        run_command(
+            ["./configure", "--config-cache", f"--prefix={prefix}"],
+            cwd=src_dir,
+            env=env,
+        )
+    run_command(["make", f"-j{jobs}"], cwd=src_dir, env=env)
+    run_command(["make", "install"], cwd=src_dir, env=env)
+
+
+def build_occt(src_root, prefix, jobs):
+    src_dir = find_src_dir(src_root, "OCCT")
+    build_dir = src_dir / "build"
+    rmtree_async(build_dir)
+    build_dir.mkdir()
+    env = ccache_env()
+    run_command(
+        [
+            "cmake",
+            "-DCMAKE_BUILD_TYPE=Release",
+            *ccache_cmake_args(),
+            *compile_flags_cmake_args(),
+            f"-DCMAKE_INSTALL_PREFIX={prefix}",
+            f"-D3RDPARTY_TCL_DIR={prefix}",
+            f"-D3RDPARTY_TK_DIR={prefix}",
+            f"-D3RDPARTY_FREETYPE_DIR={prefix}",
+            "-DBUILD_MODULE_Draw=OFF",
+            "-DUSE_FREETYPE=ON",
+            str(src_dir),
+        ],
+        cwd=build_dir,
+        env=env,
+    )
+    run_command(["make", f"-j{jobs}"], cwd=build_dir, env=env)
+    run_command(["make", "install"], cwd=build_dir, env=env)
+
+
+_BUILDERS = {
+    "tcl": build_tcl,
+    "tk": build_tk,
+    "freetype": build_freetype,
+    "swig": build_swig,
+    "occt": build_occt,
+}
+
+
+def _source_fingerprint(src_root, name):
+    """Identity of the source tarball feeding ``name``: filename, size, mtime."""
+    for tar_path in sorted(Path(src_root).glob("*.tar.gz")):
+        if tar_path.name.lower().startswith(name.lower()):
+            st = tar_path.stat()
+            return f"{tar_path.name} {st.st_size} {st.st_mtime_ns}"
+    return None
+
+
+def _build_job(name, src_root, prefix, jobs, force=False):
+    """Top-level picklable entry point for multiprocessing workers.
+
+    Skips the build when a stamp under the install prefix shows the unit was
+    already built from the same source tarball; ``force`` rebuilds anyway.
+    """
+    set_log(Path(prefix) / ".logs" / f"{name}.log")
+    stamp = Path(prefix) / ".stamps" / f"{name}.stamp"
+    fingerprint = _source_fingerprint(src_root, name)
+    if (
+        not force
+        and fingerprint
+        and stamp.exists()
+        and stamp.read_text() == fingerprint
+    ):
+        print(f"{name}: up to date, skipping", flush=True)
+        return
+    _BUILDERS[name](src_root, prefix, jobs)
+    if fingerprint:
+        stamp.parent.mkdir(parents=True, exist_ok=True)
+        stamp.write_text(fingerprint)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--party3-src",
+        default="party3_src",
+        help="directory containing the third-party source tarballs",
+    )
+    parser.add_argument(
+        "--prefix",
+        default=str(Path.cwd() / "install" / "3rdparty"),
+        help="installation prefix for the third-party stack",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="rebuild every unit even when its stamp says it is up to date",
+    )
+    args = parser.parse_args()
+
+    src_root = Path(args.party3_src).resolve()
+    prefix = Path(args.prefix).resolve()
+    prefix.mkdir(parents=True, exist_ok=True)
+
+    configure_ccache()
+
+    # The archives are independent and decompression is single-threaded per
+    # archive, so extract them concurrently instead of one after another.
+    tarballs = sorted(src_root.glob("*.tar.gz"))
+    if tarballs:
+        with multiprocessing.Pool(min(len(tarballs), jobs())) as pool:
+            pool.starmap(extract_tar, [(tar_path, src_root) for tar_path in tarballs])
+
+    cpu = jobs()
+    # Tcl, FreeType and SWIG are independent; build them concurrently and
+    # split the cores between them so make -j does not oversubscribe.
+    parallel_jobs = [("tcl",), ("freetype",), ("swig",)]
+    jobs_each = max(1, cpu // len(parallel_jobs))
+    with multiprocessing.Pool(len(parallel_jobs)) as pool:
+        pool.starmap(
+            _build_job,
+            [(name, src_root, prefix, jobs_each, args.force) for (name,) in parallel_jobs],
+        )
+
+    # Tk needs the installed Tcl; OCCT needs Tcl/Tk/FreeType.
+    _build_job("tk", src_root, prefix, cpu, args.force)
+    _build_job("occt", src_root, prefix, cpu, args.force)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
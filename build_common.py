@@ -0,0 +1,175 @@
+"""Helpers shared by the pythonocc-builder build scripts.
+
+Subprocess running with per-job log capture, CPU sizing, background
+tree deletion and the common CMake speed-up arguments live here so
+build_3rdparty.py and build_wheels.py cannot drift apart again.
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import uuid
+from pathlib import Path
+
+
+def _drain(stream, sink):
+    """Pump ``stream`` to ``sink`` whole lines at a time."""
+    with stream:
+        for line in iter(stream.readline, b""):
+            sink.write(line)
+            sink.flush()
+
+
+# Per-process log sink; set by the build drivers so each worker's
+# verbose make/configure output bypasses the console entirely.
+_LOG_PATH = None
+
+
+def set_log(path):
+    global _LOG_PATH
+    _LOG_PATH = Path(path)
+    _LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+
+
+def _tail(path, lines=50):
+    """Last ``lines`` lines of a log file, decoded leniently."""
+    try:
+        content = Path(path).read_bytes()
+    except OSError:
+        return ""
+    return b"\n".join(content.splitlines()[-lines:]).decode(errors="replace")
+
+
+def run_command(cmd, cwd=None, env=None):
+    """Run a command, echoing it first, and raise on failure.
+
+    When a per-job log is configured the child's merged output goes
+    straight to that file (no pipe, no line-buffered console writes) and
+    only the tail is replayed on failure.  Otherwise a reader thread
+    drains the pipe so a verbose child never blocks on backpressure and
+    concurrent builds emit whole lines rather than torn ones.
+    """
+    cmd = [str(c) for c in cmd]
+    print(f"+ {' '.join(cmd)}", flush=True)
+    if _LOG_PATH is not None:
+        with open(_LOG_PATH, "ab") as log:
+            returncode = subprocess.call(
+                cmd, cwd=cwd, env=env, stdout=log, stderr=subprocess.STDOUT
+            )
+        if returncode:
+            print(
+                f"command failed (full log: {_LOG_PATH}):\n{_tail(_LOG_PATH)}",
+                file=sys.stderr,
+                flush=True,
+            )
+            raise subprocess.CalledProcessError(returncode, cmd)
+        return
+    proc = subprocess.Popen(
+        cmd, cwd=cwd, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT
+    )
+    reader = threading.Thread(
+        target=_drain, args=(proc.stdout, sys.stdout.buffer), daemon=True
+    )
+    reader.start()
+    returncode = proc.wait()
+    reader.join()
+    if returncode:
+        raise subprocess.CalledProcessError(returncode, cmd)
+
+
+def jobs():
+    """Number of CPUs actually available, honouring cgroup/taskset limits."""
+    try:
+        return max(1, len(os.sched_getaffinity(0)))
+    except AttributeError:
+        return max(1, os.cpu_count() or 1)
+
+
+def rmtree_async(path):
+    """Move ``path`` aside instantly and delete it in the background.
+
+    Deleting a stale build tree inode-by-inode can take minutes; the
+    rename frees the name immediately and a daemon thread does the slow
+    unlinking while the next build already runs.
+    """
+    path = Path(path)
+    if not path.exists():
+        return
+    doomed = path.with_name(f"{path.name}.old.{uuid.uuid4().hex}")
+    os.rename(path, doomed)
+    threading.Thread(
+        target=shutil.rmtree, args=(doomed,), kwargs={"ignore_errors": True}, daemon=True
+    ).start()
+
+
+def link_or_copy(src, dst):
+    """Hardlink ``src`` to ``dst``, copying only across filesystems."""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def configure_ccache():
+    """One-time ccache tuning; a no-op when ccache is not installed.
+
+    OCCT plus the per-version pythonocc builds produce far more objects
+    than ccache's 5G default holds, so without a bigger cap the cache
+    evicts itself between runs and every build is cold.  Compression
+    roughly doubles what fits.  --set-config is persistent, so rerunning
+    this is idempotent.
+    """
+    ccache = shutil.which("ccache")
+    if not ccache:
+        return
+    subprocess.run([ccache, "--set-config", "max_size=20G"], check=False)
+    subprocess.run([ccache, "--set-config", "compression=true"], check=False)
+
+
+def ccache_env(env=None):
+    """Copy of ``env`` (default: os.environ) tuned for ccache hits.
+
+    The sloppiness settings keep header mtime churn from tarball
+    re-extraction and __TIME__-style macros from invalidating otherwise
+    identical compiles.  Untouched when ccache is not installed.
+    """
+    env = dict(os.environ if env is None else env)
+    if shutil.which("ccache"):
+        env.setdefault(
+            "CCACHE_SLOPPINESS", "pch_defines,time_macros,include_file_mtime"
+        )
+    return env
+
+
+def ccache_cmake_args():
+    """CMake arguments routing compilation through ccache, if it is installed."""
+    ccache = shutil.which("ccache")
+    if not ccache:
+        return []
+    return [
+        f"-DCMAKE_C_COMPILER_LAUNCHER={ccache}",
+        f"-DCMAKE_CXX_COMPILER_LAUNCHER={ccache}",
+    ]
+
+
+def compile_flags_cmake_args():
+    """Release compile flags plus the fastest linker installed.
+
+    -pipe keeps the compiler-to-assembler handoff out of temp files, and
+    mold/lld cut the long OCCT and SWIG-extension link phases by an
+    order of magnitude over BFD ld.
+    """
+    args = [
+        "-DCMAKE_C_FLAGS_RELEASE=-O2 -pipe",
+        "-DCMAKE_CXX_FLAGS_RELEASE=-O2 -pipe -g0",
+    ]
+    for linker in ("mold", "lld"):
+        if shutil.which(linker):
+            args += [
+                f"-DCMAKE_EXE_LINKER_FLAGS=-fuse-ld={linker}",
+                f"-DCMAKE_SHARED_LINKER_FLAGS=-fuse-ld={linker}",
+            ]
+            break
+    return args
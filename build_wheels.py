@@ -0,0 +1,458 @@
+#!/usr/bin/env python3
+"""Build pythonocc-core manylinux wheels for several CPython versions.
+
+For each requested version a venv is created with uv, pythonocc-core is
+configured and compiled against it, packaged as a wheel and repaired with
+auditwheel.  The per-version builds are fully independent (disjoint build
+directories, disjoint outputs) and run concurrently in worker processes.
+"""
+
+import argparse
+import concurrent.futures
+import dataclasses
+import functools
+import json
+import os
+import shutil
+import stat
+import subprocess
+import sys
+from pathlib import Path
+
+from build_common import (
+    ccache_cmake_args,
+    ccache_env,
+    compile_flags_cmake_args,
+    configure_ccache,
+    jobs,
+    link_or_copy,
+    rmtree_async,
+    run_command,
+    set_log,
+)
+
+# One-shot probe run inside the target interpreter: fetches every config
+# value the build needs in a single spawn instead of one subprocess each.
+_PROBE_SCRIPT = """\
+import json, sys, sysconfig
+try:
+    import numpy
+    numpy_include = numpy.get_include()
+except ImportError:
+    numpy_include = None
+print(json.dumps({
+    "version": sysconfig.get_python_version(),
+    "include": sysconfig.get_path("include"),
+    "numpy_include": numpy_include,
+    "LIBDIR": sysconfig.get_config_var("LIBDIR"),
+    "LIBPL": sysconfig.get_config_var("LIBPL"),
+    "LDLIBRARY": sysconfig.get_config_var("LDLIBRARY"),
+    "MULTIARCH": sysconfig.get_config_var("MULTIARCH"),
+    "platlibdir": getattr(sys, "platlibdir", "lib"),
+}))
+"""
+
+_probe_cache = {}
+
+
+@functools.cache
+def _sc(name):
+    """Cached sysconfig.get_config_var for the running interpreter.
+
+    Each uncached get_config_var can trigger lazy parsing of the
+    interpreter's _sysconfigdata module; a long-lived driver asking for
+    the same handful of vars should pay that once.
+    """
+    import sysconfig
+
+    return sysconfig.get_config_var(name)
+
+
+def _is_running_interpreter(python_exe):
+    """True only when ``python_exe`` is this very interpreter.
+
+    realpath equality is not enough: a venv's bin/python symlinks to the
+    base interpreter, so resolving it would answer a venv probe with the
+    driver's own environment (wrong paths, wrong numpy).  An interpreter
+    with a pyvenv.cfg beside its bin/ directory therefore only matches
+    by unresolved path.
+    """
+    exe = os.path.abspath(str(python_exe))
+    if exe == os.path.abspath(sys.executable):
+        return True
+    pyvenv_cfg = os.path.join(os.path.dirname(os.path.dirname(exe)), "pyvenv.cfg")
+    if os.path.exists(pyvenv_cfg):
+        return False
+    return os.path.realpath(exe) == os.path.realpath(sys.executable)
+
+
+def probe_python(python_exe):
+    """Return the config dict for ``python_exe``, spawning it at most once.
+
+    When ``python_exe`` is the running interpreter the values are read
+    straight from sysconfig with no subprocess at all.
+    """
+    key = str(python_exe)
+    if key not in _probe_cache:
+        if _is_running_interpreter(key):
+            import sysconfig
+
+            try:
+                import numpy
+
+                numpy_include = numpy.get_include()
+            except ImportError:
+                numpy_include = None
+            _probe_cache[key] = {
+                "version": sysconfig.get_python_version(),
+                "include": sysconfig.get_path("include"),
+                "numpy_include": numpy_include,
+                "LIBDIR": _sc("LIBDIR"),
+                "LIBPL": _sc("LIBPL"),
+                "LDLIBRARY": _sc("LDLIBRARY"),
+                "MULTIARCH": _sc("MULTIARCH"),
+                "platlibdir": getattr(sys, "platlibdir", "lib"),
+            }
+        else:
+            out = subprocess.check_output([key, "-c", _PROBE_SCRIPT], text=True)
+            _probe_cache[key] = json.loads(out)
+    return _probe_cache[key]
+
+
+def _uv_env(venvs_dir):
+    """Environment for uv calls: one shared cache next to the venvs."""
+    env = dict(os.environ)
+    env.setdefault("UV_CACHE_DIR", str(Path(venvs_dir) / ".uv-cache"))
+    return env
+
+
+def create_venv(py_ver, venvs_dir):
+    """Create (if needed) the venv for ``py_ver`` and return its path."""
+    venv_path = Path(venvs_dir) / f"venv-{py_ver}"
+    if not venv_path.exists():
+        run_command(
+            ["uv", "venv", "--python", py_ver, str(venv_path)], env=_uv_env(venvs_dir)
+        )
+    return venv_path
+
+
+def install_build_deps(venv_path, venvs_dir):
+    """Install the build dependencies into one venv.
+
+    All venvs share one uv cache and install via hardlinks, so only the
+    first install pays the download/unpack cost of each wheel.
+    """
+    python_exe = Path(venv_path) / "bin" / "python"
+    run_command(
+        [
+            "uv",
+            "pip",
+            "install",
+            "--link-mode=hardlink",
+            "--python",
+            str(python_exe),
+            "numpy",
+            "wheel",
+            "build",
+            "auditwheel",
+        ],
+        env=_uv_env(venvs_dir),
+    )
+
+
+def scan_libpython(candidate_dir, ver):
+    """One scandir pass collecting shared and static libpythons.
+
+    Returns ``(shared, static)`` as sorted path lists; a single directory
+    walk replaces the two glob scans (one per suffix) used previously.
+    Missing or non-directory candidates yield empty results, so callers
+    need no isdir pre-check of their own.
+    """
+    prefix = f"libpython{ver}"
+    shared, static = [], []
+    try:
+        entries = os.scandir(candidate_dir)
+    except OSError:
+        return shared, static
+    with entries:
+        for entry in entries:
+            name = entry.name
+            if not name.startswith(prefix):
+                continue
+            if ".so" in name:
+                shared.append(entry.path)
+            elif name.endswith(".a"):
+                static.append(entry.path)
+    return sorted(shared), sorted(static)
+
+
+def is_regular_file(path):
+    """True when ``path`` resolves to a regular file.
+
+    One stat call replaces the exists+isdir pair (two syscalls), and on
+    most distros LDLIBRARY resolves directly so this is the whole search.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+    return stat.S_ISREG(st.st_mode)
+
+
+def library_dir_candidates(cfg):
+    """Directories that can hold libpython, derived from sysconfig.
+
+    Built from LIBDIR, its MULTIARCH subdirectory, the interpreter's
+    platlibdir sibling and the config dir (LIBPL); deterministic for the
+    interpreter at hand instead of a speculative lib64 guess.
+    """
+    candidates = []
+    libdir = cfg["LIBDIR"]
+    if libdir:
+        candidates.append(libdir)
+        if cfg.get("MULTIARCH"):
+            candidates.append(os.path.join(libdir, cfg["MULTIARCH"]))
+        platlibdir = cfg.get("platlibdir") or "lib"
+        if os.path.basename(libdir) != platlibdir:
+            candidates.append(os.path.join(os.path.dirname(libdir), platlibdir))
+    if cfg.get("LIBPL"):
+        candidates.append(cfg["LIBPL"])
+    return candidates
+
+
+def find_python_library(cfg):
+    """Resolve libpython from a probe dict, falling back to a directory search."""
+    libdir = cfg["LIBDIR"]
+    ldlibrary = cfg["LDLIBRARY"]
+    # Both vars can be None (e.g. static-only builds leave LDLIBRARY
+    # unset); fall through to the candidate-directory search then.
+    library = os.path.join(libdir, ldlibrary) if libdir and ldlibrary else None
+    if library is not None and is_regular_file(library):
+        return library
+    ver = cfg["version"]
+    for candidate_dir in library_dir_candidates(cfg):
+        shared, static = scan_libpython(candidate_dir, ver)
+        if shared:
+            return shared[0]
+        if static:
+            return static[0]
+    raise FileNotFoundError(f"no libpython{ver} found under {cfg['LIBDIR']}")
+
+
+@dataclasses.dataclass(frozen=True)
+class BuildContext:
+    """Fully-resolved paths for one per-version build.
+
+    Built once per version in main so the workers never repeat Path
+    construction or .resolve() (each resolve is a realpath syscall chain).
+    """
+
+    py_ver: str
+    venv_path: Path
+    python_exe: Path
+    src_dir: Path
+    pkg_dir: Path
+    build_dir: Path
+    install_dir: Path
+    dist_dir: Path
+    wheelhouse: Path
+    occt_install: Path
+    occt_lib_path: Path
+    log_path: Path
+    patchelf_page_size: int | None
+    make_jobs: int
+
+
+def make_context(py_ver, args, make_jobs):
+    """Resolve every path the build for ``py_ver`` will touch, exactly once."""
+    venv_path = Path(args.venvs_dir).resolve() / f"venv-{py_ver}"
+    build_base_dir = Path(args.build_base_dir).resolve()
+    occt_install = Path(args.occt_install).resolve()
+    return BuildContext(
+        py_ver=py_ver,
+        venv_path=venv_path,
+        python_exe=venv_path / "bin" / "python",
+        src_dir=Path(args.src_dir).resolve(),
+        pkg_dir=build_base_dir / f"pkg-{py_ver}",
+        build_dir=build_base_dir / f"pythonocc-{py_ver}",
+        install_dir=build_base_dir / f"install-{py_ver}",
+        dist_dir=Path(args.dist_dir).resolve(),
+        wheelhouse=Path(args.wheelhouse).resolve(),
+        occt_install=occt_install,
+        occt_lib_path=occt_install / "lib",
+        log_path=build_base_dir / "logs" / f"{py_ver}.log",
+        patchelf_page_size=args.patchelf_page_size,
+        make_jobs=make_jobs,
+    )
+
+
+def compile_pythonocc(ctx):
+    """Configure and compile pythonocc-core against the given venv."""
+    python_exe = ctx.python_exe
+    cfg = probe_python(python_exe)
+    if cfg["numpy_include"] is None:
+        raise RuntimeError(f"numpy is not importable from {python_exe}")
+    numpy_include = cfg["numpy_include"]
+    python_include = cfg["include"]
+    python_library = find_python_library(cfg)
+
+    build_dir = ctx.build_dir
+    # A build dir with a valid cache is reused: cmake only re-runs the
+    # configure checks whose -D inputs changed and keeps the generated
+    # SWIG build graph, instead of re-globbing everything from scratch.
+    if not (build_dir / "CMakeCache.txt").exists():
+        rmtree_async(build_dir)
+        build_dir.mkdir(parents=True)
+    env = ccache_env()
+    run_command(
+        [
+            "cmake",
+            "-DCMAKE_BUILD_TYPE=Release",
+            *ccache_cmake_args(),
+            *compile_flags_cmake_args(),
+            f"-DCMAKE_INSTALL_PREFIX={ctx.install_dir}",
+            f"-DOCCT_INCLUDE_DIR={ctx.occt_install}/include/opencascade",
+            f"-DOCCT_LIBRARY_DIR={ctx.occt_lib_path}",
+            f"-DPYTHON_EXECUTABLE={python_exe}",
+            f"-DPYTHON_INCLUDE_DIR={python_include}",
+            f"-DPYTHON_LIBRARY={python_library}",
+            f"-DNUMPY_INCLUDE_DIR={numpy_include}",
+            str(ctx.src_dir),
+        ],
+        cwd=build_dir,
+        env=env,
+    )
+    run_command(["make", f"-j{ctx.make_jobs}"], cwd=build_dir, env=env)
+    run_command(["make", "install"], cwd=build_dir, env=env)
+    return ctx.install_dir
+
+
+def package_wheel(ctx):
+    """Produce the raw (linux_x86_64) wheel for this version.
+
+    The build backend writes scratch (build/, *.egg-info) into the
+    project directory, so concurrent versions must not package the
+    shared checkout in place.  Each version packages a hardlink clone of
+    the source under its own pkg dir instead; the links cost no space
+    and the clones never see each other's scratch.
+    """
+    rmtree_async(ctx.pkg_dir)
+    shutil.copytree(
+        ctx.src_dir,
+        ctx.pkg_dir,
+        copy_function=link_or_copy,
+        ignore=shutil.ignore_patterns(".git", "build", "*.egg-info"),
+    )
+    run_command(
+        [str(ctx.python_exe), "-m", "build", "--wheel", "--outdir", str(ctx.dist_dir)],
+        cwd=ctx.pkg_dir,
+    )
+    tag = "cp" + ctx.py_ver.replace(".", "")
+    wheels = sorted(ctx.dist_dir.glob(f"*-{tag}-*.whl"))
+    if not wheels:
+        raise FileNotFoundError(f"no wheel produced for {ctx.py_ver} in {ctx.dist_dir}")
+    return wheels[-1]
+
+
+def repair_wheel(ctx, wheel_path):
+    """Run auditwheel repair so the wheel is tagged manylinux."""
+    env = dict(os.environ)
+    env["LD_LIBRARY_PATH"] = os.pathsep.join(
+        [str(ctx.occt_lib_path), env.get("LD_LIBRARY_PATH", "")]
+    ).rstrip(os.pathsep)
+    cmd = [
+        str(ctx.python_exe),
+        "-m",
+        "auditwheel",
+        "repair",
+        "--plat",
+        "manylinux_2_28_x86_64",
+        "-w",
+        str(ctx.wheelhouse),
+    ]
+    if ctx.patchelf_page_size:
+        # Needed on 64K-page targets (e.g. some aarch64 kernels) so the
+        # rewritten ELF segments stay loadable.
+        cmd += ["--patchelf-args", f"--page-size {ctx.patchelf_page_size}"]
+    run_command(cmd + [str(wheel_path)], env=env)
+
+
+def build_version(ctx):
+    """End-to-end build for one CPython version (runs in a worker process)."""
+    set_log(ctx.log_path)
+    compile_pythonocc(ctx)
+    wheel_path = package_wheel(ctx)
+    repair_wheel(ctx, wheel_path)
+    return ctx.py_ver
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--py-versions",
+        nargs="+",
+        default=["3.12", "3.13", "3.14"],
+        help="CPython versions to build wheels for",
+    )
+    parser.add_argument("--src-dir", default="pythonocc-core-src")
+    parser.add_argument("--build-base-dir", default="build")
+    parser.add_argument("--venvs-dir", default="venvs")
+    parser.add_argument("--dist-dir", default="dist")
+    parser.add_argument("--wheelhouse", default="wheelhouse")
+    parser.add_argument(
+        "--patchelf-page-size",
+        type=int,
+        default=None,
+        help="pass --page-size to patchelf during repair (e.g. 65536 for 64K-page aarch64)",
+    )
+    parser.add_argument(
+        "--occt-install",
+        default=str(Path.cwd() / "install" / "3rdparty"),
+        help="prefix the third-party stack (OCCT included) was installed to",
+    )
+    args = parser.parse_args()
+
+    for d in (args.build_base_dir, args.venvs_dir, args.dist_dir, args.wheelhouse):
+        Path(d).mkdir(parents=True, exist_ok=True)
+
+    configure_ccache()
+
+    # Venv creation is cheap; do it upfront, then run the four uv installs
+    # concurrently (they are subprocesses bottlenecked on I/O, and after the
+    # first one the rest hardlink out of the shared cache).
+    venv_paths = [create_venv(py_ver, args.venvs_dir) for py_ver in args.py_versions]
+    with concurrent.futures.ThreadPoolExecutor(len(venv_paths)) as executor:
+        list(
+            executor.map(
+                lambda venv_path: install_build_deps(venv_path, args.venvs_dir),
+                venv_paths,
+            )
+        )
+
+    # Each version has its own venv, build dir and outputs, so the builds are
+    # embarrassingly parallel; fan out across processes instead of looping.
+    # Cap the concurrency so every build keeps at least four cores, and split
+    # the CPUs between the workers so N concurrent makes never spawn
+    # N * nproc compile jobs (same scheme as build_3rdparty.py).
+    cpu = jobs()
+    max_workers = max(1, min(len(args.py_versions), cpu // 4))
+    make_jobs = max(1, cpu // max_workers)
+    contexts = [make_context(py_ver, args, make_jobs) for py_ver in args.py_versions]
+    failures = []
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=max_workers
+    ) as executor:
+        futures = {executor.submit(build_version, ctx): ctx.py_ver for ctx in contexts}
+        for future in concurrent.futures.as_completed(futures):
+            py_ver = futures[future]
+            try:
+                future.result()
+                print(f"built wheel for {py_ver}", flush=True)
+            except Exception as exc:
+                failures.append(py_ver)
+                print(f"build failed for {py_ver}: {exc}", file=sys.stderr, flush=True)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
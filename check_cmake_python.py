@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Check that CMake's FindPython will resolve the interpreter we expect.
+
+Mirrors the PYTHON_INCLUDE_DIR / PYTHON_LIBRARY resolution performed by
+build_wheels.py and prints the values CMake should see, so a broken
+interpreter layout is caught before a long OCCT configure run.
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+from build_wheels import (
+    is_regular_file,
+    library_dir_candidates,
+    probe_python,
+    scan_libpython,
+)
+
+_CACHE_FILE = Path.home() / ".cache" / "pythonocc-builder" / "pylib.json"
+
+
+def _cache_key(python_exe):
+    """Identity of an interpreter: realpath plus binary mtime."""
+    exe = os.path.realpath(python_exe)
+    try:
+        mtime = os.stat(exe).st_mtime_ns
+    except OSError:
+        return None
+    return f"{exe}:{mtime}"
+
+
+def _cached_library(key):
+    try:
+        library = json.loads(_CACHE_FILE.read_text()).get(key)
+    except (OSError, ValueError):
+        return None
+    # A cached path is only trusted while it still exists.
+    if library and os.path.exists(library):
+        return library
+    return None
+
+
+def _store_library(key, library):
+    try:
+        cache = json.loads(_CACHE_FILE.read_text())
+    except (OSError, ValueError):
+        cache = {}
+    cache[key] = library
+    _CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    _CACHE_FILE.write_text(json.dumps(cache, indent=2, sort_keys=True))
+
+
+def check_python_detection(python_exe=None, use_cache=True):
+    """Resolve and report include dir and libpython for ``python_exe``.
+
+    With no argument the current interpreter is inspected in-process;
+    otherwise a single probe subprocess fetches its sysconfig data.
+    ``use_cache=False`` forces a fresh filesystem search, bypassing the
+    on-disk result cache for both reading and writing.
+    Returns the resolved library path, or ``None`` if no libpython was found.
+    """
+    if python_exe is None:
+        python_exe = sys.executable
+    # probe_python answers in-process for the running interpreter and
+    # caches one subprocess per foreign interpreter.
+    cfg = probe_python(python_exe)
+    ver = cfg["version"]
+    include = cfg["include"]
+    libdir = cfg["LIBDIR"]
+    ldlibrary = cfg["LDLIBRARY"]
+
+    print(f"interpreter:  {python_exe}")
+    print(f"version:      {ver}")
+    print(f"include dir:  {include}")
+
+    key = _cache_key(python_exe) if use_cache else None
+    cached = _cached_library(key) if key else None
+    if cached is not None:
+        print(f"libpython:    {cached} (cached)")
+        return cached
+
+    library = os.path.join(libdir, ldlibrary) if libdir and ldlibrary else None
+    if library is None or not is_regular_file(library):
+        # LDLIBRARY does not resolve directly; search the directories
+        # sysconfig says this interpreter installs libraries into,
+        # preferring shared over static.  Each candidate costs one
+        # scandir pass, no fnmatch.
+        library = None
+        for candidate_dir in library_dir_candidates(cfg):
+            shared, static = scan_libpython(candidate_dir, ver)
+            if shared:
+                library = shared[0]
+                break
+            if static:
+                library = static[0]
+                break
+
+    if library is None:
+        print("libpython:    NOT FOUND", file=sys.stderr)
+    else:
+        print(f"libpython:    {library}")
+        if key:
+            _store_library(key, library)
+    return library
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "python_exe",
+        nargs="?",
+        default=None,
+        help="interpreter to inspect (defaults to the running one)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="ignore the cached libpython result and search again",
+    )
+    args = parser.parse_args()
+    library = check_python_detection(args.python_exe, use_cache=not args.no_cache)
+    return 0 if library else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
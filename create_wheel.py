@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""Assemble a pythonocc-core wheel directly from an install tree.
+
+Packs the ``OCC`` package produced by ``make install`` into a PEP 427
+wheel without involving setuptools: the payload streams straight into
+the archive, METADATA/WHEEL are written by hand and RECORD is generated
+from content digests computed along the way.
+"""
+
+import argparse
+import base64
+import concurrent.futures
+import hashlib
+import os
+import py_compile
+import shutil
+import subprocess
+import sys
+import time
+import zipfile
+import zlib
+from pathlib import Path
+
+DIST_NAME = "pythonocc_core"
+SUMMARY = "Python bindings for the Open CASCADE Technology CAD kernel"
+
+
+def _urlsafe_b64(digest):
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+
+def _record_hash_name():
+    """Hash algorithm for RECORD entries.
+
+    sha256 runs at multiple GB/s with the SHA-NI instructions but drops
+    to a few hundred MB/s without them, where blake2b is considerably
+    faster; the wheel spec allows any guaranteed hashlib algorithm other
+    than md5/sha1.  PYTHONOCC_RECORD_HASH overrides the choice (e.g. to
+    force sha256 for published wheels from an old build host).
+    """
+    override = os.environ.get("PYTHONOCC_RECORD_HASH")
+    if override:
+        return override
+    try:
+        cpuinfo = Path("/proc/cpuinfo").read_text()
+    except OSError:
+        return "sha256"
+    return "sha256" if "sha_ni" in cpuinfo else "blake2b"
+
+
+class WheelFile:
+    """Minimal PEP 427 wheel writer."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.zip = zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED)
+        self._records = []
+        self._hash_name = _record_hash_name()
+
+    @staticmethod
+    def _compress_type(arcname):
+        """Deflate text, store shared libraries.
+
+        The .so files dominate a pythonocc wheel and are essentially
+        incompressible, so deflating them burns minutes of zlib CPU for
+        almost no size win; pip installs stored entries just fine.
+        """
+        if ".so" in arcname.rsplit("/", 1)[-1]:
+            return zipfile.ZIP_STORED
+        return zipfile.ZIP_DEFLATED
+
+    def write(self, src_path, arcname):
+        """Add one file under ``arcname`` and remember its RECORD entry.
+
+        The file is read exactly once: each 1MB chunk feeds the RECORD
+        digest and the zip entry in the same pass, instead of
+        zipfile reading the file and the RECORD hash reading it again.
+        """
+        src_path = Path(src_path)
+        zinfo = zipfile.ZipInfo.from_file(src_path, arcname)
+        zinfo.compress_type = self._compress_type(arcname)
+        digest = hashlib.new(self._hash_name)
+        size = 0
+        with open(src_path, "rb") as src, self.zip.open(zinfo, "w") as dst:
+            while chunk := src.read(1024 * 1024):
+                digest.update(chunk)
+                dst.write(chunk)
+                size += len(chunk)
+        self._records.append(
+            (arcname, f"{self._hash_name}={_urlsafe_b64(digest.digest())}", size)
+        )
+
+    def write_deflated_many(self, jobs):
+        """Compress ``(arcname, src_path)`` pairs in threads, append serially.
+
+        zipfile funnels every deflate through the writing thread; for the
+        long tail of small .py/.pyc entries the Python-level overhead per
+        entry adds up.  zlib releases the GIL, so worker threads read,
+        hash and compress while the main thread only appends the
+        ready-made raw streams to the archive.
+        """
+
+        def prepare(job):
+            arcname, src_path = job
+            data = Path(src_path).read_bytes()
+            compressor = zlib.compressobj(
+                zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15
+            )
+            comp_data = compressor.compress(data) + compressor.flush()
+            digest = hashlib.new(self._hash_name, data).digest()
+            return arcname, len(data), zlib.crc32(data), digest, comp_data
+
+        with concurrent.futures.ThreadPoolExecutor() as executor:
+            for arcname, size, crc, digest, comp_data in executor.map(prepare, jobs):
+                self._append_precompressed(arcname, size, crc, comp_data)
+                self._records.append(
+                    (arcname, f"{self._hash_name}={_urlsafe_b64(digest)}", size)
+                )
+
+    def _append_precompressed(self, arcname, size, crc, comp_data):
+        """Append one already-deflated entry to the underlying zip."""
+        zf = self.zip
+        zinfo = zipfile.ZipInfo(arcname, date_time=time.localtime()[:6])
+        zinfo.compress_type = zipfile.ZIP_DEFLATED
+        zinfo.external_attr = 0o644 << 16
+        zinfo.file_size = size
+        zinfo.compress_size = len(comp_data)
+        zinfo.CRC = crc
+        zinfo.header_offset = zf.fp.tell()
+        zf.fp.write(zinfo.FileHeader(zip64=False))
+        zf.fp.write(comp_data)
+        zf.filelist.append(zinfo)
+        zf.NameToInfo[zinfo.filename] = zinfo
+        zf._didModify = True
+        zf.start_dir = zf.fp.tell()
+
+    def writestr(self, arcname, text):
+        """Add an in-memory text entry and remember its RECORD entry."""
+        data = text.encode()
+        self.zip.writestr(arcname, data)
+        digest = hashlib.new(self._hash_name, data).digest()
+        self._records.append(
+            (arcname, f"{self._hash_name}={_urlsafe_b64(digest)}", len(data))
+        )
+
+    def write_record(self, dist_info_dir):
+        record_name = f"{dist_info_dir}/RECORD"
+        lines = [f"{name},{hash_},{size}" for name, hash_, size in self._records]
+        lines.append(f"{record_name},,")
+        self.zip.writestr(record_name, "\n".join(lines) + "\n")
+
+    def close(self):
+        self.zip.close()
+
+
+def strip_library(src_path, stripped_path):
+    """Write a --strip-unneeded copy of ``src_path`` to ``stripped_path``.
+
+    Returns the stripped path, or the original when strip is missing or
+    refuses the file (non-ELF payloads).  The install tree itself is
+    never modified.
+    """
+    strip = shutil.which("strip")
+    if strip is None:
+        return src_path
+    stripped_path.parent.mkdir(parents=True, exist_ok=True)
+    result = subprocess.run(
+        [strip, "--strip-unneeded", "-o", str(stripped_path), str(src_path)],
+        capture_output=True,
+    )
+    if result.returncode != 0:
+        return src_path
+    return stripped_path
+
+
+def _compile_source(job):
+    """Top-level worker: byte-compile one source file to a scratch pyc."""
+    src, cfile = job
+    Path(cfile).parent.mkdir(parents=True, exist_ok=True)
+    py_compile.compile(
+        str(src),
+        cfile=str(cfile),
+        quiet=1,
+        invalidation_mode=py_compile.PycInvalidationMode.CHECKED_HASH,
+    )
+
+
+def precompile_sources(src_dir, pyc_dir, py_tag):
+    """Byte-compile every .py under ``src_dir`` into ``pyc_dir``, in parallel.
+
+    Shipping the pycs spares users the per-import compile on first run.
+    Bytecode is interpreter-specific, so this only happens when the
+    running interpreter's cache tag matches the wheel's python tag;
+    returns a mapping of source path to pyc path (empty if skipped).
+    """
+    cache_tag = sys.implementation.cache_tag
+    want_tag = f"cpython-{py_tag[2:]}" if py_tag.startswith("cp") else None
+    if want_tag != cache_tag:
+        print(f"skipping pyc precompile: running {cache_tag}, wheel targets {py_tag}")
+        return {}
+    jobs = []
+    for src in src_dir.rglob("*.py"):
+        rel = src.relative_to(src_dir)
+        cfile = pyc_dir / rel.parent / "__pycache__" / f"{rel.stem}.{cache_tag}.pyc"
+        jobs.append((src, cfile))
+    if not jobs:
+        return {}
+    with concurrent.futures.ProcessPoolExecutor() as executor:
+        list(executor.map(_compile_source, jobs, chunksize=16))
+    return {src: cfile for src, cfile in jobs if cfile.exists()}
+
+
+def warn_if_no_ccache():
+    """Nudge toward ccache when the environment is not using it.
+
+    create_wheel only packs the install tree, but the compile that
+    produces that tree is what dominates an edit-rebuild-repack loop;
+    builds driven through build_3rdparty/build_wheels already inject
+    ccache via CMAKE_*_COMPILER_LAUNCHER, this covers everything else.
+    """
+    if shutil.which("ccache") is None:
+        return
+    cc = os.environ.get("CC", "")
+    cxx = os.environ.get("CXX", "")
+    if "ccache" in cc and "ccache" in cxx:
+        return
+    print(
+        'hint: ccache is installed but CC/CXX do not use it; '
+        'export CC="ccache gcc" CXX="ccache g++" to speed up '
+        "rebuilds of the install tree",
+        file=sys.stderr,
+    )
+
+
+def content_fingerprint(src_dir):
+    """Cheap identity of the install tree: blake2b over path, size, mtime.
+
+    Stat metadata is enough to catch any reinstall from a changed build
+    without re-reading the tree's hundreds of MB.
+    """
+    digest = hashlib.blake2b()
+    for file_path in sorted(p for p in src_dir.rglob("*") if p.is_file()):
+        st = file_path.stat()
+        rel = file_path.relative_to(src_dir).as_posix()
+        digest.update(f"{rel}\0{st.st_size}\0{st.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+
+def metadata_text(version):
+    return (
+        "Metadata-Version: 2.1\n"
+        f"Name: {DIST_NAME.replace('_', '-')}\n"
+        f"Version: {version}\n"
+        f"Summary: {SUMMARY}\n"
+    )
+
+
+def wheel_text(py_tag, abi_tag, plat_tag):
+    return (
+        "Wheel-Version: 1.0\n"
+        "Generator: pythonocc-builder\n"
+        "Root-Is-Purelib: false\n"
+        f"Tag: {py_tag}-{abi_tag}-{plat_tag}\n"
+    )
+
+
+def create_wheel(src_dir, build_base, version, py_tag, plat_tag, output_dir, force=False):
+    """Zip ``src_dir`` up as the OCC package of a wheel.
+
+    The payload streams straight from the install tree into the zip —
+    no staging copy of the package, so every byte is read once and no
+    transient disk space is consumed.  Only the tiny dist-info files are
+    materialized under ``build_wheel_<tag>``.  ``force`` repacks even
+    when the content marker says the existing wheel is current.
+    """
+    src_dir = Path(src_dir)
+    abi_tag = py_tag
+    build_dir = Path(build_base) / f"build_wheel_{py_tag}"
+    output_dir = Path(output_dir)
+    wheel_path = output_dir / f"{DIST_NAME}-{version}-{py_tag}-{abi_tag}-{plat_tag}.whl"
+
+    # An unchanged install tree with an existing output means there is
+    # nothing to do; the marker survives from the previous successful run.
+    fingerprint = content_fingerprint(src_dir)
+    marker = build_dir / ".content-hash"
+    if (
+        not force
+        and wheel_path.exists()
+        and marker.exists()
+        and marker.read_text().strip() == fingerprint
+    ):
+        print(f"unchanged, keeping {wheel_path}")
+        return wheel_path
+
+    if build_dir.exists():
+        shutil.rmtree(build_dir)
+    build_dir.mkdir(parents=True)
+
+    dist_info_dir = f"{DIST_NAME}-{version}.dist-info"
+    output_dir.mkdir(parents=True, exist_ok=True)
+    wf = WheelFile(wheel_path)
+    try:
+        strip_dir = build_dir / "stripped"
+        pycs = precompile_sources(src_dir, build_dir / "pycache", py_tag)
+        deflated = []
+        for src_path in sorted(p for p in src_dir.rglob("*") if p.is_file()):
+            rel = src_path.relative_to(src_dir)
+            arcname = f"OCC/{rel.as_posix()}"
+            if ".so" in src_path.name:
+                # Debug symbols are dead weight for wheel consumers;
+                # shipping stripped libraries cuts the wheel severalfold.
+                wf.write(strip_library(src_path, strip_dir / rel), arcname)
+            else:
+                deflated.append((arcname, src_path))
+            if src_path in pycs:
+                cfile = pycs[src_path]
+                pyc_arc = (rel.parent / "__pycache__" / cfile.name).as_posix()
+                deflated.append((f"OCC/{pyc_arc}", cfile))
+        wf.write_deflated_many(deflated)
+        # The metadata is a couple hundred bytes of generated text; write
+        # it straight into the zip rather than round-tripping via disk.
+        wf.writestr(f"{dist_info_dir}/METADATA", metadata_text(version))
+        wf.writestr(f"{dist_info_dir}/WHEEL", wheel_text(py_tag, abi_tag, plat_tag))
+        wf.write_record(dist_info_dir)
+    finally:
+        wf.close()
+    marker.write_text(fingerprint + "\n")
+    print(f"wrote {wheel_path}")
+    return wheel_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--src-dir",
+        default=str(Path.cwd() / "install" / "pythonocc"),
+        help="installed OCC package to pack into the wheel",
+    )
+    parser.add_argument("--build-base", default="build")
+    parser.add_argument("--version", default="7.9.0")
+    parser.add_argument(
+        "--py-tags", nargs="+", default=["cp312"], help="e.g. cp312 cp313 cp314"
+    )
+    parser.add_argument("--plat-tag", default="manylinux_2_28_x86_64")
+    parser.add_argument("--output-dir", default="wheelhouse")
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="repack even when the content hash says the wheel is current",
+    )
+    args = parser.parse_args()
+
+    warn_if_no_ccache()
+
+    if len(args.py_tags) == 1:
+        create_wheel(
+            args.src_dir,
+            args.build_base,
+            args.version,
+            args.py_tags[0],
+            args.plat_tag,
+            args.output_dir,
+            args.force,
+        )
+        return 0
+
+    # The per-tag wheels use disjoint build_wheel_<tag> dirs and outputs,
+    # and the work is I/O plus zlib CPU, so build them in worker processes.
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=len(args.py_tags)
+    ) as executor:
+        futures = [
+            executor.submit(
+                create_wheel,
+                args.src_dir,
+                args.build_base,
+                args.version,
+                py_tag,
+                args.plat_tag,
+                args.output_dir,
+                args.force,
+            )
+            for py_tag in args.py_tags
+        ]
+        for future in futures:
+            future.result()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())